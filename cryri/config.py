@@ -1,6 +1,6 @@
 from typing import List, Dict, Annotated
 
-from pydantic import BaseModel, AfterValidator
+from pydantic import BaseModel, AfterValidator, Field
 
 from cryri.validators import expand_vars_and_user, sanitize_dir_path
 
@@ -37,5 +37,5 @@ class CloudConfig(BaseModel):
 
 
 class CryConfig(BaseModel):
-    container: ContainerConfig = ContainerConfig()
-    cloud: CloudConfig = CloudConfig()
+    container: ContainerConfig = Field(default_factory=ContainerConfig)
+    cloud: CloudConfig = Field(default_factory=CloudConfig)
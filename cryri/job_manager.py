@@ -1,54 +1,194 @@
 import io
 import logging
-from typing import Optional, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Any, Optional, List, Dict, Tuple
 from contextlib import redirect_stdout
-from rich.console import Console
 
-try:
-    import client_lib
-except ModuleNotFoundError:
-    logging.warning("client_lib not found. Some functionality may be limited.")
+logger = logging.getLogger(__name__)
+
+JOBS_TTL = 2.0
+KILL_MAX_WORKERS = 8
+INSTANCE_TYPES_TTL = 300.0
+# lengths of hash prefixes users typically paste; indexed for a direct dict probe
+HASH_PREFIX_LENGTHS = (6, 8)
+
+# region -> (fetch time, response); shared across JobManager instances
+_INSTANCE_TYPES_CACHE: Dict[str, Tuple[float, Any]] = {}
+_SEP = " : "
+
+
+def get_client_lib():
+    """Import `client_lib` on first use, so paths that never talk to the cloud skip its import cost."""
+    try:
+        import client_lib  # pylint: disable=import-outside-toplevel
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError(
+            "client_lib not found. It is required to submit and manage jobs, "
+            "make sure cryri runs in the cloud environment where client_lib is installed."
+        ) from e
+    return client_lib
 
 
 class JobManager:
-    def __init__(self, region: str):
+    def __init__(self, region: str, jobs_ttl: float = JOBS_TTL):
         self.region = region
-        self.console = Console()
+
+        self._jobs_cache: Optional[List[str]] = None
+        self._jobs_cache_ts = 0.0
+        self._jobs_ttl = jobs_ttl
+        self._jobs_buffer = io.StringIO()
+        self._hash_index: Optional[Dict[str, str]] = None
+        self._prefix_index: Dict[str, List[str]] = {}
 
     def get_jobs(self) -> List[str]:
-        buffer = io.StringIO()
+        """Return the job listing, reusing the last fetched one for `jobs_ttl` seconds."""
+        if (
+            self._jobs_cache is not None
+            and time.monotonic() - self._jobs_cache_ts < self._jobs_ttl
+        ):
+            return self._jobs_cache
+
+        # client_lib only prints the listing, so capture stdout into a reused buffer
+        buffer = self._jobs_buffer
+        buffer.seek(0)
+        buffer.truncate(0)
         with redirect_stdout(buffer):
-            client_lib.jobs(region=self.region)
-        output = buffer.getvalue()
-        buffer.close()
-        return output.splitlines()
-
-    def find_job_by_hash(self, partial_hash: str) -> Optional[str]:
-        """Find a job by partial hash match. Returns full hash if found, None otherwise."""
-        for job_name in self.get_jobs():
-            job_hash = self.raw_job_to_id(job_name)
-            if partial_hash in job_hash:
-                return job_hash
-        return None
+            get_client_lib().jobs(region=self.region)
+
+        lines = buffer.getvalue().split("\n")
+        if lines[-1] == "":
+            lines.pop()
+
+        self._jobs_cache = lines
+        self._hash_index = None
+        self._jobs_cache_ts = time.monotonic()
+        return self._jobs_cache
+
+    @cached_property
+    def console(self):
+        from rich.console import Console  # pylint: disable=import-outside-toplevel
+        return Console()
+
+    def invalidate_jobs_cache(self) -> None:
+        """Drop the cached job listing, so the next lookup refetches it."""
+        self._jobs_cache = None
+        self._hash_index = None
+
+    def refresh_jobs(self) -> List[str]:
+        """Drop the cached job listing and fetch a fresh one."""
+        self.invalidate_jobs_cache()
+        return self.get_jobs()
+
+    def get_hash_index(self) -> Dict[str, str]:
+        """Map full job hash -> raw job line, rebuilt only when the job listing changes."""
+        jobs = self.get_jobs()
+        if self._hash_index is None:
+            self._hash_index = {self.raw_job_to_id(job): job for job in jobs}
+            self._prefix_index = {}
+            for job_hash in self._hash_index:
+                for length in HASH_PREFIX_LENGTHS:
+                    self._prefix_index.setdefault(job_hash[:length], []).append(job_hash)
+        return self._hash_index
+
+    def find_jobs_by_hash(self, partial_hash: str) -> List[str]:
+        """
+        All full hashes matching `partial_hash`: the exact hash if known, else every hash
+        starting with it, else every hash containing it.
+        """
+        # an empty fragment is a substring of every hash, never treat it as a match
+        if not partial_hash:
+            return []
+
+        index = self.get_hash_index()
+        if partial_hash in index:
+            return [partial_hash]
+
+        if len(partial_hash) in HASH_PREFIX_LENGTHS:
+            candidates = list(self._prefix_index.get(partial_hash, []))
+        else:
+            candidates = [job_hash for job_hash in index if job_hash.startswith(partial_hash)]
+        if candidates:
+            return candidates
+
+        return [job_hash for job_hash in index if partial_hash in job_hash]
+
+    def find_job_by_hash(self, partial_hash: str, strict: bool = False) -> Optional[str]:
+        """
+        Find a job by partial hash match. Returns full hash if found, None otherwise.
+        An ambiguous hash is resolved to the first match with a warning, or refused if `strict`.
+        """
+        matches = self.find_jobs_by_hash(partial_hash)
+        if len(matches) > 1:
+            if strict:
+                logger.error(
+                    "Hash %s is ambiguous (%s), refusing to pick one", partial_hash, ", ".join(matches)
+                )
+                return None
+            logger.warning("Hash %s is ambiguous (%s), using %s", partial_hash, ", ".join(matches), matches[0])
+        elif not matches:
+            logger.error("No job found with hash: %s", partial_hash)
+        return matches[0] if matches else None
 
     @staticmethod
     def raw_job_to_id(job_string: str) -> str:
-        return job_string.split(" : ")[1].strip()
+        # the hash is the second field, same as `split(_SEP)[1]`, even when more fields follow it
+        return job_string.partition(_SEP)[2].partition(_SEP)[0].strip()
 
     def get_instance_types(self):
-        return client_lib.get_instance_types(regions=self.region)
+        """Return instance types for the region, reusing a response younger than `INSTANCE_TYPES_TTL`."""
+        cached = _INSTANCE_TYPES_CACHE.get(self.region)
+        if cached is not None and time.monotonic() - cached[0] < INSTANCE_TYPES_TTL:
+            return cached[1]
+
+        instance_types = get_client_lib().get_instance_types(regions=self.region)
+        _INSTANCE_TYPES_CACHE[self.region] = (time.monotonic(), instance_types)
+        return instance_types
 
     def show_logs(self, job_hash: str) -> None:
         full_hash = self.find_job_by_hash(job_hash)
         if full_hash:
-            client_lib.logs(full_hash, region=self.region)
-        else:
-            logging.error("No job found with hash: %s", job_hash)
+            get_client_lib().logs(full_hash, region=self.region)
 
     def kill_job(self, job_hash: str) -> None:
-        full_hash = self.find_job_by_hash(job_hash)
+        # never kill a guess: an ambiguous hash is refused
+        full_hash = self.find_job_by_hash(job_hash, strict=True)
         if full_hash:
-            client_lib.kill(full_hash, region=self.region)
-            logging.info("Job %s terminated successfully", full_hash)
-        else:
-            logging.error("No job found with hash: %s", job_hash)
+            get_client_lib().kill(full_hash, region=self.region)
+            logger.info("Job %s terminated successfully", full_hash)
+            self.invalidate_jobs_cache()
+
+    def kill_jobs(self, job_hashes: List[str]) -> None:
+        """Terminate several jobs, resolving all hashes against a single job listing."""
+        full_hashes = []
+        for job_hash in job_hashes:
+            full_hash = self.find_job_by_hash(job_hash, strict=True)
+            if full_hash and full_hash not in full_hashes:
+                # several fragments may resolve to the same job, kill it once
+                full_hashes.append(full_hash)
+        if not full_hashes:
+            return
+
+        client_lib = get_client_lib()
+
+        def _kill(full_hash: str) -> bool:
+            try:
+                client_lib.kill(full_hash, region=self.region)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # keep killing the rest, the failures are reported together below
+                logger.error("Failed to terminate job %s: %s", full_hash, e)
+                return False
+            logger.info("Job %s terminated successfully", full_hash)
+            return True
+
+        try:
+            # bounded pool, so a long hash list does not open a flood of connections at once
+            with ThreadPoolExecutor(max_workers=min(KILL_MAX_WORKERS, len(full_hashes))) as executor:
+                killed = list(executor.map(_kill, full_hashes))
+        finally:
+            self.invalidate_jobs_cache()
+
+        failed = [full_hash for full_hash, ok in zip(full_hashes, killed) if not ok]
+        if failed:
+            raise RuntimeError(f"Failed to terminate jobs: {', '.join(failed)}")
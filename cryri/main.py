@@ -1,19 +1,24 @@
 import argparse
-import importlib
+import importlib.metadata
 import logging
+import shlex
+from functools import lru_cache
+from typing import List, Optional
 
-import yaml
+from pydantic import TypeAdapter
 
-from cryri.config import CryConfig, CloudConfig
-from cryri.job_manager import JobManager
+from cryri.config import CryConfig, CloudConfig, ContainerConfig
+from cryri.job_manager import JobManager, get_client_lib
 from cryri.utils import (
     create_job_description, create_run_copy
 )
 
-try:
-    import client_lib
-except ModuleNotFoundError:
-    logging.warning("client_lib not found. Some functionality may be limited.")
+logger = logging.getLogger(__name__)
+
+# Same validator as `CryConfig.model_validate`, kept as one reusable entry point for YAML configs
+_CRY_ADAPTER = TypeAdapter(CryConfig)
+# pylint: disable-next=unsubscriptable-object  # pydantic metaclass attribute, not seen by pylint
+_DEFAULT_REGION = CloudConfig.model_fields["region"].default
 
 
 def submit_run(cfg: CryConfig) -> str:
@@ -24,13 +29,13 @@ def submit_run(cfg: CryConfig) -> str:
         cfg.container.work_dir = create_run_copy(cfg.container)
 
     job_description = create_job_description(cfg)
-    logging.info("Submitting job with description: %s", job_description)
+    logger.info("Submitting job with description: %s", job_description)
 
     try:
-        quoted_command = cfg.container.command.replace('"', '\\"')
-        run_script = f'bash -c "cd {cfg.container.work_dir} && {quoted_command}"'
+        inner_script = f"cd {shlex.quote(cfg.container.work_dir)} && {cfg.container.command}"
+        run_script = f"bash -c {shlex.quote(inner_script)}"
 
-        job = client_lib.Job(
+        job = get_client_lib().Job(
             base_image=cfg.container.image,
             script=run_script,
             instance_type=cfg.cloud.instance_type,
@@ -44,35 +49,42 @@ def submit_run(cfg: CryConfig) -> str:
         )
         return job.submit()
     except Exception as e:
-        logging.error("Failed to submit job: %s", e)
+        logger.error("Failed to submit job: %s", e)
         raise
 
 
 def _config_from_args(args):
-    cloud_cfg = CloudConfig()
-    if args.region is not None:
-        cloud_cfg.region = args.region
+    """Build a config from CLI args without running validators.
 
-    cfg = CryConfig(cloud=cloud_cfg)
-    return cfg
+    Argparse values are trusted plain strings, so `model_construct` is safe here.
+    YAML configs are untrusted and still go through full validation.
+    """
+    cloud_cfg = CloudConfig.model_construct(region=args.region or _DEFAULT_REGION)
+    return CryConfig.model_construct(cloud=cloud_cfg, container=ContainerConfig.model_construct())
 
 
 def _handle_config_file(config_file: str) -> None:
     """Handle the configuration file processing and job submission."""
-    logging.info("Running configuration from: %s", config_file)
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    # libyaml-backed loader when PyYAML was built with it, pure-Python one otherwise
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    logger.info("Running configuration from: %s", config_file)
     try:
-        with open(config_file, "r", encoding="utf-8") as file:
-            cfg = CryConfig(**yaml.safe_load(file))
+        # bytes go straight to the parser, which detects and decodes UTF-8 itself (in C for libyaml)
+        with open(config_file, "rb") as file:
+            cfg = _CRY_ADAPTER.validate_python(yaml.load(file.read(), Loader=loader))
             status = submit_run(cfg)
-            logging.info("Job submitted with status: %s", status)
+            logger.info("Job submitted with status: %s", status)
     except FileNotFoundError:
-        logging.error("Configuration file '%s' not found.", config_file)
+        logger.error("Configuration file '%s' not found.", config_file)
     except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
+        logger.error("Error parsing YAML file: %s", e)
 
 
 def get_instance_types(region):
-    return client_lib.get_instance_types(regions=region)
+    return JobManager(region).get_instance_types()
 
 
 def _setup_arg_parser():
@@ -104,8 +116,8 @@ def _setup_arg_parser():
     # Option 3: Kill job
     parser.add_argument(
         "--kill",
-        metavar="HASH",
-        help="Provide the hash of the job to terminate it."
+        metavar="HASH[,HASH...]",
+        help="Provide the hash of the job to terminate it. Several comma-separated hashes are accepted."
     )
 
     parser.add_argument(
@@ -125,50 +137,94 @@ def _setup_arg_parser():
     return parser
 
 
-def _check_version():
-    """Check and print the version of cryri."""
+_PARSER = _setup_arg_parser()
+
+
+@lru_cache(maxsize=None)
+def _cryri_version() -> Optional[str]:
+    """Look up the installed cryri version once; None if the package is not installed."""
     try:
-        version = importlib.metadata.version("cryri")
-        print(version)
+        return importlib.metadata.version("cryri")
     except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _check_version():
+    """Check and print the version of cryri."""
+    version = _cryri_version()
+    if version is None:
         print("Cryri package not found.")
+    else:
+        print(version)
 
 
-def _execute_command(args, job_manager):
+def _show_logs(args, job_manager):
+    job_manager.show_logs(args.logs)
+
+
+def _show_instance_types(_args, job_manager):
+    instance_types_table = job_manager.get_instance_types()
+    job_manager.console.print(instance_types_table)
+
+
+def _show_jobs(_args, job_manager):
+    for job in job_manager.get_jobs():
+        print(job)
+
+
+def _parse_job_hashes(value: str) -> List[str]:
+    """Split a comma-separated hash list, dropping blanks and duplicates while keeping order."""
+    return list(dict.fromkeys(h.strip() for h in value.split(",") if h.strip()))
+
+
+def _kill_jobs(args, job_manager):
+    job_hashes = _parse_job_hashes(args.kill)
+    if not job_hashes:
+        logger.error("No job hash provided to --kill: %r", args.kill)
+    elif len(job_hashes) == 1:
+        job_manager.kill_job(job_hashes[0])
+    else:
+        job_manager.kill_jobs(job_hashes)
+
+
+# (argument, handler) pairs in priority order; a JobManager is built only for the selected one
+_JOB_COMMANDS = (
+    ("logs", _show_logs),
+    ("instance_types", _show_instance_types),
+    ("jobs", _show_jobs),
+    ("kill", _kill_jobs),
+)
+
+
+def _execute_command(args, region):
     """Execute the appropriate command based on the provided arguments."""
-    if args.logs:
-        job_manager.show_logs(args.logs)
-    elif args.instance_types:
-        instance_types_table = job_manager.get_instance_types()
-        job_manager.console.print(instance_types_table)
-    elif args.jobs:
-        for job in job_manager.get_jobs():
-            print(job)
-    elif args.kill:
-        job_manager.kill_job(args.kill)
-    elif args.config_file:
+    for arg_name, handler in _JOB_COMMANDS:
+        if getattr(args, arg_name):
+            handler(args, JobManager(region))
+            return
+
+    if args.config_file:
         _handle_config_file(args.config_file)
     else:
-        logging.warning("No valid arguments provided. Use --help for more information.")
+        logger.warning("No valid arguments provided. Use --help for more information.")
 
 
 def main():
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-    parser = _setup_arg_parser()
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
 
     if args.version:
         _check_version()
         return
 
     cfg = _config_from_args(args)
-    job_manager = JobManager(cfg.cloud.region)
 
     try:
-        _execute_command(args, job_manager)
+        _execute_command(args, cfg.cloud.region)
     except Exception as e:
-        logging.error("An error occurred: %s", e)
+        logger.error("An error occurred: %s", e)
         raise
 
 
@@ -1,25 +1,32 @@
-import hashlib
+import fnmatch
 import os
+import re
+import secrets
 import shutil
+import stat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 
 from cryri.config import CryConfig, ContainerConfig
 from cryri.validators import expand_vars_and_user, sanitize_dir_path
 
 DATETIME_FORMAT = "%Y_%m_%d_%H%M"
 HASH_LENGTH = 6
+JUPYTER_HOME = "/home/jovyan"
+_SLASH_TO_DASH = str.maketrans({"/": "-"})
+
+COPY_BUFSIZE = 1024 * 1024
+COPY_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
 
 def create_job_description(cfg: CryConfig) -> str:
     job_description = cfg.cloud.description
     if job_description is None:
-        job_description = cfg.container.work_dir
-        for prefix in ['/home/jovyan']:
-            if job_description.startswith(prefix):
-                job_description = job_description[len(prefix):]
-                break
-        job_description = job_description.replace('/', '-')
+        job_description = cfg.container.work_dir.removeprefix(JUPYTER_HOME).translate(_SLASH_TO_DASH)
 
     team_name = None
     if cfg.container.environment is not None:
@@ -33,23 +40,166 @@ def create_job_description(cfg: CryConfig) -> str:
     return job_description
 
 
+@lru_cache(maxsize=16)
+def _compile_ignore(patterns: Tuple[str, ...]) -> Optional[Callable]:
+    """`shutil.ignore_patterns` equivalent matching all patterns with one precompiled regex."""
+    if not patterns:
+        return None
+
+    regex = re.compile("|".join(
+        f"(?:{fnmatch.translate(os.path.normcase(p))})" for p in patterns
+    ))
+
+    def _ignore(_dirpath, names):
+        return {name for name in names if regex.match(os.path.normcase(name))}
+
+    return _ignore
+
+
+def _copy_file_range(fsrc, fdst) -> bool:
+    """Copy in-kernel with `os.copy_file_range`; False if the caller has to fall back to a buffered copy."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    try:
+        # some filesystems report 0 on the first call even for non-empty files
+        if not os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_BUFSIZE):
+            return False
+        while os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_BUFSIZE):
+            pass
+        return True
+    except OSError:
+        # e.g. unsupported filesystem: restart from scratch with the buffered copy
+        fsrc.seek(0)
+        fdst.seek(0)
+        fdst.truncate()
+        return False
+
+
+def _copyfile(src: str, dst: str) -> None:
+    """Copy a regular file's contents (in-kernel when possible) and permission bits."""
+    # never open special files: reading e.g. a named pipe would block forever
+    if not stat.S_ISREG(os.lstat(src).st_mode):
+        raise shutil.SpecialFileError(f"`{src}` is not a regular file")
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if not _copy_file_range(fsrc, fdst):
+            buffer = bytearray(COPY_BUFSIZE)
+            view = memoryview(buffer)
+            while n_read := fsrc.readinto(buffer):
+                fdst.write(view[:n_read])
+
+    shutil.copymode(src, dst)
+
+
+def _copy_symlink(src_root: str, link_path: str, dst_path: str) -> None:
+    """
+    Recreate a symlink at `dst_path` so the copy stays a snapshot of `src_root`: targets inside
+    `src_root` are made relative, so they point into the copy, and targets outside it are made absolute.
+    """
+    link_dir = os.path.dirname(link_path)
+    target = os.path.normpath(os.path.join(link_dir, os.readlink(link_path)))
+    if os.path.commonpath([target, src_root]) == src_root:
+        target = os.path.relpath(target, link_dir)
+    os.symlink(target, dst_path)
+
+
+def _scandir(src_dir: str, dst_dir: str, errors: List[Tuple[str, str, str]]) -> List[os.DirEntry]:
+    """List `src_dir`; an unreadable directory is recorded in `errors` and treated as empty."""
+    try:
+        with os.scandir(src_dir) as it:
+            return list(it)
+    except OSError as why:
+        errors.append((src_dir, dst_dir, str(why)))
+        return []
+
+
+def _collect_tree(
+        src: str, dst: str, ignore: Optional[Callable], errors: List[Tuple[str, str, str]]
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Recreate the directory layout (and symlinks) of `src` in `dst`; return the directory pairs
+    and the regular file pairs left to copy.
+    Failures are appended to `errors` as `(src, dst, reason)`, like `shutil.copytree` does.
+    """
+    src = os.path.abspath(src)
+    os.makedirs(dst)
+    dir_pairs = [(src, dst)]
+    file_pairs = []
+    pending = deque(dir_pairs)
+    while pending:
+        src_dir, dst_dir = pending.popleft()
+        entries = _scandir(src_dir, dst_dir, errors)
+        ignored = ignore(src_dir, [entry.name for entry in entries]) if ignore is not None else set()
+
+        for entry in entries:
+            if entry.name in ignored:
+                continue
+            dst_path = os.path.join(dst_dir, entry.name)
+            try:
+                # DirEntry answers these from the scandir data, without an extra stat per entry
+                if entry.is_symlink():
+                    _copy_symlink(src, entry.path, dst_path)
+                elif entry.is_dir(follow_symlinks=False):
+                    os.mkdir(dst_path)
+                    dir_pairs.append((entry.path, dst_path))
+                    pending.append((entry.path, dst_path))
+                elif entry.is_file(follow_symlinks=False):
+                    file_pairs.append((entry.path, dst_path))
+                else:
+                    # named pipes, sockets, devices: copying them would block or make no sense
+                    errors.append((entry.path, dst_path, f"`{entry.path}` is not a regular file"))
+            except OSError as why:
+                errors.append((entry.path, dst_path, str(why)))
+
+    return dir_pairs, file_pairs
+
+
+def _copyfile_pair(pair: Tuple[str, str]) -> Optional[Tuple[str, str, str]]:
+    try:
+        _copyfile(*pair)
+    except OSError as why:
+        return pair[0], pair[1], str(why)
+    return None
+
+
+def _fast_copytree(src: str, dst: str, ignore: Optional[Callable] = None) -> None:
+    """
+    `shutil.copytree(src, dst, ignore=ignore)` equivalent that copies files in a thread pool,
+    so per-file syscall latency of many small files overlaps. Symlinks are recreated by `_copy_symlink`.
+    Like copytree, it copies everything it can and then raises `shutil.Error` listing the failures.
+    """
+    errors = []
+    dir_pairs, file_pairs = _collect_tree(src, dst, ignore, errors)
+    with ThreadPoolExecutor(max_workers=COPY_MAX_WORKERS) as executor:
+        errors.extend(error for error in executor.map(_copyfile_pair, file_pairs) if error is not None)
+
+    # deepest first and only once the files are in, so read-only directories can still be filled
+    for src_dir, dst_dir in reversed(dir_pairs):
+        try:
+            shutil.copystat(src_dir, dst_dir)
+        except OSError as why:
+            errors.append((src_dir, dst_dir, str(why)))
+
+    if errors:
+        raise shutil.Error(errors)
+
+
 def create_run_copy(cfg: ContainerConfig) -> str:
     """Create a copy of the work directory for the run."""
     now = datetime.now()
     now_str = now.strftime(DATETIME_FORMAT)
-    hash_suffix = hashlib.sha1(
-        now.strftime(f"{DATETIME_FORMAT}%S").encode()
-    ).hexdigest()[:HASH_LENGTH]
+    hash_suffix = secrets.token_hex(HASH_LENGTH // 2)
 
     run_copy_dir = str(
         Path(cfg.cry_copy_dir) / f"run_{now_str}_{hash_suffix}"
     )
 
-    ignore_func = shutil.ignore_patterns(*cfg.exclude_from_copy)
-    shutil.copytree(
+    # symlinks are kept as links instead of copying whatever they point to; links into the work dir
+    # are retargeted into the copy, links escaping it are made absolute so they still resolve from the copy
+    _fast_copytree(
         src=cfg.work_dir,
         dst=run_copy_dir,
-        ignore=ignore_func
+        ignore=_compile_ignore(tuple(cfg.exclude_from_copy)),
     )
 
     return run_copy_dir
@@ -1,46 +1,56 @@
 import logging
-from os.path import expanduser, expandvars
+import os
+import re
+from os.path import expanduser
 from pathlib import Path
 from typing import Union, Tuple, Any, List, Dict, Optional
 
+logger = logging.getLogger(__name__)
+
+# `$NAME` or `${NAME}`, same syntax as `os.path.expandvars` on POSIX
+_VAR_RE = re.compile(r"\$(\w+)|\$\{([^}]+)\}", re.ASCII)
+
+
+def _expand_vars(s: str) -> str:
+    """Expand known env vars in `s`, leaving unknown ones as-is."""
+    return _VAR_RE.sub(lambda m: os.environ.get(m.group(1) or m.group(2), m.group(0)), s)
+
 
 def expand_vars_and_user(
         s: Union[None, str, Tuple[Any], List[Any], Dict[Any, Any]]
 ) -> Union[None, str, Tuple[Any], List[Any], Dict[Any, Any]]:
     """
-    Universal function that returns a copy of an input with values expanded,
+    Universal function that returns an input with values expanded,
     if they are str and contain known expandable parts (`~` home or `$XXX` env var).
 
-    Original object is returned iff it is not a subject for expansion. So, it's better
-    read as "this is not an in-place/mutating operation!"
+    The input is never mutated. A new container is built only if some value inside it
+    was expanded; otherwise the original object itself is returned (also for nested
+    containers). So the result may share objects with the input: copy it before mutating
+    if the input must stay intact.
     """
 
     if s is None:
         return None
 
-    if isinstance(s, tuple):
-        # noinspection PyTypeChecker
-        return tuple(expand_vars_and_user(x) for x in s)
-
-    if isinstance(s, list):
-        return [expand_vars_and_user(x) for x in s]
+    if isinstance(s, (tuple, list, dict)):
+        return _expand_items(s)
 
-    if isinstance(s, dict):
-        return {k: expand_vars_and_user(v) for k, v in s.items()}
-
-    if not isinstance(s, str):
+    # fast path: nothing to expand (`~` is only expanded as a leading char)
+    if not isinstance(s, str) or ("$" not in s and not s.startswith("~")):
         return s
 
     # NB: expand vars then user, since vars could be expanded into a path
     #   that requires user expansion
     # NB: expect only known/existing environment vars to be expanded!
     #   others will be left as-is
-    s = expanduser(expandvars(s))
+    s = _expand_vars(s)
+    if s.startswith("~"):
+        s = expanduser(s)
 
     # notify user if any $'s in the string to catch cases when env vars
     # are expected to be present while they are not (e.g. rc-file sourcing failed)
     if "$" in s:
-        logging.warning(
+        logger.warning(
             'After env vars expansion, the value still contains a `$`: "%s".\n'
             'Note: This might be a false alarm — just ensuring a potential silent issue '
             'does not go unnoticed.',
@@ -50,6 +60,23 @@ def expand_vars_and_user(
     return s
 
 
+def _expand_items(
+        s: Union[Tuple[Any], List[Any], Dict[Any, Any]]
+) -> Union[Tuple[Any], List[Any], Dict[Any, Any]]:
+    """Expand container items; the original container is returned if no item changed."""
+    if isinstance(s, dict):
+        expanded = {k: expand_vars_and_user(v) for k, v in s.items()}
+        changed = any(expanded[k] is not v for k, v in s.items())
+    else:
+        expanded = [expand_vars_and_user(x) for x in s]
+        changed = any(new is not old for new, old in zip(expanded, s))
+        if isinstance(s, tuple):
+            # noinspection PyTypeChecker
+            expanded = tuple(expanded)
+
+    return expanded if changed else s
+
+
 def sanitize_dir_path(p: Optional[str]) -> Optional[str]:
     if p is None:
         return None
@@ -46,7 +46,7 @@ setup(
     entry_points={"console_scripts": ["cryri=cryri.main:main"], },
     python_requires='>=3.6',
     install_requires=[
-        "pydantic",
+        "pydantic>=2",
         "rich",
         "pyyaml",
         "argparse",
@@ -0,0 +1,19 @@
+# pylint: disable=redefined-outer-name
+
+import pytest
+import yaml
+
+from cryri.config import CryConfig
+from tests.utils.configs import TEST_CONFIG_YAML
+
+
+@pytest.fixture(scope="session")
+def test_config_dict():
+    """TEST_CONFIG_YAML parsed once per session (libyaml-backed loader when available)."""
+    return yaml.load(TEST_CONFIG_YAML, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+# function-scoped: consumers like submit_run may mutate the model (e.g. `work_dir`)
+@pytest.fixture
+def test_cry_config(test_config_dict):
+    return CryConfig(**test_config_dict)
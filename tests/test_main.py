@@ -1,11 +1,17 @@
 # pylint: disable=redefined-outer-name
 
+import os
+import shutil
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
 import pytest
 
 from cryri.config import CryConfig, ContainerConfig, CloudConfig
-from cryri.job_manager import JobManager
+from cryri.job_manager import JobManager, get_client_lib
 from cryri.utils import (
-    create_job_description
+    create_job_description, create_run_copy, _copyfile
 )
 from tests.utils.mocks import mock_path_resolution, make_is_dir_mock, mock_env_vars
 
@@ -42,6 +48,165 @@ def test_container_config_defaults():
     assert config.cry_copy_dir is None
 
 
+def test_get_client_lib_missing():
+    with patch.dict(sys.modules, {"client_lib": None}):
+        with pytest.raises(ModuleNotFoundError, match="client_lib not found"):
+            get_client_lib()
+
+
+def _print_jobs(region):
+    print(f"{region}-job-a : hash-aaa111")
+    print(f"{region}-job-b : hash-bbb222")
+
+
+def test_job_manager_get_jobs_cached(job_manager):
+    client_lib = MagicMock()
+    client_lib.jobs.side_effect = _print_jobs
+    with patch.dict(sys.modules, {"client_lib": client_lib}):
+
+        assert job_manager.get_jobs() == [
+            "SR006-job-a : hash-aaa111",
+            "SR006-job-b : hash-bbb222",
+        ]
+        assert job_manager.find_job_by_hash("bbb") == "hash-bbb222"
+        assert job_manager.find_job_by_hash("hash-aaa111") == "hash-aaa111"
+        assert job_manager.find_job_by_hash("ccc") is None
+        assert client_lib.jobs.call_count == 1
+
+        assert job_manager.refresh_jobs() == [
+            "SR006-job-a : hash-aaa111",
+            "SR006-job-b : hash-bbb222",
+        ]
+        assert client_lib.jobs.call_count == 2
+
+        client_lib.jobs.side_effect = None
+        assert not job_manager.refresh_jobs()
+
+
+def test_job_manager_find_job_by_prefix(job_manager, caplog):
+    def _print_similar_jobs(region):
+        print(f"{region}-job-a : 1a2b3c4d5e")
+        print(f"{region}-job-b : 1a2b3c4dff")
+        print(f"{region}-job-c : 9f9f1a2b3c")
+
+    client_lib = MagicMock()
+    client_lib.jobs.side_effect = _print_similar_jobs
+    with patch.dict(sys.modules, {"client_lib": client_lib}):
+        assert job_manager.find_job_by_hash("1a2b3c4d5e") == "1a2b3c4d5e"
+        # 6-char prefix goes through the prefix index, other fragments through the substring scan
+        assert job_manager.find_job_by_hash("9f9f1a") == "9f9f1a2b3c"
+        assert job_manager.find_job_by_hash("f1a2b3") == "9f9f1a2b3c"
+
+        with caplog.at_level("WARNING"):
+            assert job_manager.find_job_by_hash("1a2b3c4d") == "1a2b3c4d5e"
+        assert "ambiguous" in caplog.records[-1].message
+
+        # ambiguity is reported for any length, not only the indexed prefix lengths
+        for partial_hash, expected in [
+            ("1a2b3c4", ["1a2b3c4d5e", "1a2b3c4dff"]),
+            ("a2b3c", ["1a2b3c4d5e", "1a2b3c4dff", "9f9f1a2b3c"]),
+        ]:
+            assert job_manager.find_jobs_by_hash(partial_hash) == expected
+            with caplog.at_level("WARNING"):
+                assert job_manager.find_job_by_hash(partial_hash) == "1a2b3c4d5e"
+            assert "ambiguous" in caplog.records[-1].message
+
+        # kills never pick one of several candidates
+        job_manager.kill_job("1a2b3c4")
+        job_manager.kill_jobs(["1a2b3c4", "9f9f"])
+        assert [c.args[0] for c in client_lib.kill.call_args_list] == ["9f9f1a2b3c"]
+
+
+@pytest.mark.parametrize("job_string, expected", [
+    ("my-job : abc123", "abc123"),
+    ("my-job : abc123 : Running", "abc123"),
+    ("my-job : abc123 : Running : 2h", "abc123"),
+    ("my-job", ""),
+])
+def test_raw_job_to_id(job_string, expected):
+    assert JobManager.raw_job_to_id(job_string) == expected
+
+
+def test_job_manager_find_job_with_status_field(job_manager):
+    def _print_jobs_with_status(region):
+        print(f"{region}-job-a : hash-aaa111 : Running")
+        print(f"{region}-job-b : hash-bbb222 : Pending")
+
+    client_lib = MagicMock()
+    client_lib.jobs.side_effect = _print_jobs_with_status
+    with patch.dict(sys.modules, {"client_lib": client_lib}):
+        assert job_manager.find_job_by_hash("hash-bbb222") == "hash-bbb222"
+        job_manager.kill_job("aaa")
+
+    assert [c.args[0] for c in client_lib.kill.call_args_list] == ["hash-aaa111"]
+
+
+def test_job_manager_find_job_by_empty_hash(job_manager):
+    client_lib = MagicMock()
+    client_lib.jobs.side_effect = _print_jobs
+    with patch.dict(sys.modules, {"client_lib": client_lib}):
+        assert job_manager.find_job_by_hash("") is None
+
+
+def test_job_manager_kill_jobs_duplicates(job_manager):
+    client_lib = MagicMock()
+    client_lib.jobs.side_effect = _print_jobs
+    with patch.dict(sys.modules, {"client_lib": client_lib}):
+        job_manager.kill_jobs(["aaa", "hash-aaa111", "", "aaa"])
+
+    assert [c.args[0] for c in client_lib.kill.call_args_list] == ["hash-aaa111"]
+
+
+def test_job_manager_kill_jobs(job_manager):
+    client_lib = MagicMock()
+    client_lib.jobs.side_effect = _print_jobs
+    with patch.dict(sys.modules, {"client_lib": client_lib}):
+        job_manager.kill_jobs(["aaa", "bbb", "ccc"])
+        assert client_lib.jobs.call_count == 1
+
+        # killed jobs must not be served from the cached listing anymore
+        job_manager.get_jobs()
+        assert client_lib.jobs.call_count == 2
+    assert sorted(c.args[0] for c in client_lib.kill.call_args_list) == ["hash-aaa111", "hash-bbb222"]
+
+
+def test_job_manager_kill_jobs_partial_failure(job_manager, caplog):
+    def _print_three_jobs(region):
+        _print_jobs(region)
+        print(f"{region}-job-c : hash-ccc333")
+
+    def _kill(full_hash, region):
+        if full_hash == "hash-bbb222":
+            raise ConnectionError(f"boom in {region}")
+
+    client_lib = MagicMock()
+    client_lib.jobs.side_effect = _print_three_jobs
+    client_lib.kill.side_effect = _kill
+    with patch.dict(sys.modules, {"client_lib": client_lib}):
+        with caplog.at_level("ERROR"), pytest.raises(RuntimeError, match="hash-bbb222"):
+            job_manager.kill_jobs(["aaa", "bbb", "ccc"])
+        assert "Failed to terminate job hash-bbb222: boom in SR006" in caplog.text
+
+        # the other jobs are still killed and the listing is refetched after a failure too
+        assert sorted(c.args[0] for c in client_lib.kill.call_args_list) == [
+            "hash-aaa111", "hash-bbb222", "hash-ccc333"
+        ]
+        job_manager.get_jobs()
+        assert client_lib.jobs.call_count == 2
+
+
+def test_job_manager_instance_types_cached():
+    client_lib = MagicMock()
+    client_lib.get_instance_types.side_effect = lambda regions: f"types of {regions}"
+    with patch.dict(sys.modules, {"client_lib": client_lib}), \
+            patch.dict("cryri.job_manager._INSTANCE_TYPES_CACHE", clear=True):
+        assert JobManager("SR004").get_instance_types() == "types of SR004"
+        assert JobManager("SR004").get_instance_types() == "types of SR004"
+        assert JobManager("SR006").get_instance_types() == "types of SR006"
+
+    assert client_lib.get_instance_types.call_count == 2
+
+
 @mock_path_resolution(cwd="/mock/fake/dir")
 def test_create_job_description_basic(basic_config):
     description = create_job_description(basic_config)
@@ -55,6 +220,104 @@ def test_create_job_description_with_team(basic_config):
     assert description == "-test-dir #test-team"
 
 
+def test_create_run_copy_excludes(tmp_path):
+    work_dir = tmp_path / "work"
+    (work_dir / "data").mkdir(parents=True)
+    (work_dir / "data" / "big.bin").write_text("data")
+    (work_dir / "script.py").write_text("print('hi')")
+    (work_dir / "model.pth").write_text("weights")
+    (work_dir / "link.py").symlink_to(work_dir / "script.py")
+    (work_dir / "local_link.py").symlink_to("script.py")
+    (tmp_path / "outside").mkdir()
+    (work_dir / "outside_link").symlink_to("../outside")
+    (work_dir / "pkg" / "data").mkdir(parents=True)
+    (work_dir / "pkg" / "run.sh").write_text("#!/bin/sh\n")
+    (work_dir / "pkg" / "run.sh").chmod(0o755)
+    copy_root = tmp_path / "copies"
+    copy_root.mkdir()
+
+    config = ContainerConfig(
+        work_dir=str(work_dir),
+        cry_copy_dir=str(copy_root),
+        exclude_from_copy=["data", "*.pth"],
+    )
+    run_copy_dir = Path(create_run_copy(config))
+
+    assert run_copy_dir.parent == copy_root.resolve()
+    assert sorted(p.name for p in run_copy_dir.iterdir()) == [
+        "link.py", "local_link.py", "outside_link", "pkg", "script.py"
+    ]
+    # links into the work dir point into the copy, links escaping it are made absolute
+    assert (run_copy_dir / "link.py").is_symlink()
+    assert (run_copy_dir / "link.py").resolve().is_relative_to(run_copy_dir.resolve())
+    assert os.readlink(run_copy_dir / "link.py") == "script.py"
+    assert os.readlink(run_copy_dir / "local_link.py") == "script.py"
+    assert os.readlink(run_copy_dir / "outside_link") == str(tmp_path.resolve() / "outside")
+    assert (run_copy_dir / "outside_link").exists()
+    assert (run_copy_dir / "script.py").read_text() == "print('hi')"
+    # the copy is a snapshot: later edits to the work dir are not seen through its links
+    (work_dir / "script.py").write_text("print('edited')")
+    assert (run_copy_dir / "link.py").read_text() == "print('hi')"
+    # patterns apply at every level, and permission bits are preserved
+    assert sorted(p.name for p in (run_copy_dir / "pkg").iterdir()) == ["run.sh"]
+    assert (run_copy_dir / "pkg" / "run.sh").stat().st_mode & 0o777 == 0o755
+
+
+def test_create_run_copy_rejects_named_pipe(tmp_path):
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    (work_dir / "script.py").write_text("print('hi')")
+    os.mkfifo(work_dir / "pipe")
+    copy_root = tmp_path / "copies"
+    copy_root.mkdir()
+
+    config = ContainerConfig(work_dir=str(work_dir), cry_copy_dir=str(copy_root))
+    with pytest.raises(shutil.Error, match="not a regular file"):
+        create_run_copy(config)
+
+    # everything else is still copied, as shutil.copytree does
+    (run_copy_dir,) = copy_root.iterdir()
+    assert (run_copy_dir / "script.py").read_text() == "print('hi')"
+    assert not (run_copy_dir / "pipe").exists()
+
+
+def test_create_run_copy_skips_unreadable_dir(tmp_path):
+    work_dir = tmp_path / "work"
+    (work_dir / "sub").mkdir(parents=True)
+    (work_dir / "sub" / "hidden.py").write_text("secret")
+    (work_dir / "script.py").write_text("print('hi')")
+    (work_dir / "private").mkdir(mode=0o700)
+    copy_root = tmp_path / "copies"
+    copy_root.mkdir()
+
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if os.path.basename(path) == "sub":
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+
+    config = ContainerConfig(work_dir=str(work_dir), cry_copy_dir=str(copy_root))
+    with patch("os.scandir", side_effect=scandir), pytest.raises(shutil.Error, match="Permission denied"):
+        create_run_copy(config)
+
+    # the rest of the tree is still copied, and directory modes are preserved
+    (run_copy_dir,) = copy_root.iterdir()
+    assert (run_copy_dir / "script.py").read_text() == "print('hi')"
+    assert not (run_copy_dir / "sub" / "hidden.py").exists()
+    assert (run_copy_dir / "private").stat().st_mode & 0o777 == 0o700
+
+
+def test_copyfile_falls_back_when_copy_file_range_copies_nothing(tmp_path):
+    src, dst = tmp_path / "src.bin", tmp_path / "dst.bin"
+    src.write_bytes(b"payload" * 1000)
+
+    with patch("os.copy_file_range", create=True, return_value=0):
+        _copyfile(str(src), str(dst))
+
+    assert dst.read_bytes() == src.read_bytes()
+
+
 @mock_env_vars(
     HOME="/mock/fake_user", MY_HOME="~/sub_user",
     WANDB_API_KEY="8aead3118j2ej28e2jee",
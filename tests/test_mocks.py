@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+import pytest
+
 from tests.utils.mocks import mock_env_vars, mock_path_resolution, make_is_dir_mock
 
 
@@ -24,47 +26,39 @@ def test_mocking_env_exclude():
     with_var()
 
 
-@mock_env_vars(HOME="/mock/fake_user")
-@mock_path_resolution(
-    cwd="/mock/fake/dir", extra_resolve_map={
-        "config.yaml": "/mock/faky/fake/dir/config.yaml"
-    }
-)
-def test_mocking_path_expanduser():
-    def expanduser(path):
-        return str(Path(path).expanduser())
+def _expanduser(path):
+    return str(Path(path).expanduser())
+
 
-    assert expanduser('/') == "/"
-    assert expanduser("~/.app") == "/mock/fake_user/.app"
-    assert expanduser(".") == "."
-    assert expanduser("config.yaml") == "config.yaml"
-    assert expanduser("./path/config.yaml") == "path/config.yaml"
+def _resolve(path):
+    return str(Path(path).resolve())
 
 
+def _expanduser_resolve(path):
+    return str(Path(path).expanduser().resolve())
+
+
+@pytest.mark.parametrize("transform, path, expected", [
+    (_expanduser, "/", "/"),
+    (_expanduser, "~/.app", "/mock/fake_user/.app"),
+    (_expanduser, ".", "."),
+    (_expanduser, "config.yaml", "config.yaml"),
+    (_expanduser, "./path/config.yaml", "path/config.yaml"),
+    (_resolve, "/", "/"),
+    (_resolve, "~/.app", "/mock/fake/dir/~/.app"),
+    (_resolve, ".", "/mock/fake/dir"),
+    (_resolve, "config.yaml", "/mock/faky/fake/dir/config.yaml"),
+    (_resolve, "./path/config.yaml", "/mock/fake/dir/path/config.yaml"),
+    (_expanduser_resolve, "~/.app", "/mock/fake_user/.app"),
+])
 @mock_env_vars(HOME="/mock/fake_user")
 @mock_path_resolution(
     cwd="/mock/fake/dir", extra_resolve_map={
         "config.yaml": "/mock/faky/fake/dir/config.yaml"
     }
 )
-def test_mocking_path_resolve():
-    def resolve(path):
-        return str(Path(path).resolve())
-
-    assert resolve('/') == "/"
-    assert resolve("~/.app") == "/mock/fake/dir/~/.app"
-    assert resolve(".") == "/mock/fake/dir"
-    assert resolve("config.yaml") == "/mock/faky/fake/dir/config.yaml"
-    assert resolve("./path/config.yaml") == "/mock/fake/dir/path/config.yaml"
-
-
-@mock_env_vars(HOME="/mock/fake_user")
-@mock_path_resolution(cwd="/mock/fake/dir")
-def test_mocking_path_expanduser_resolve():
-    def expanduser_resolve(path):
-        return str(Path(path).expanduser().resolve())
-
-    assert expanduser_resolve("~/.app") == "/mock/fake_user/.app"
+def test_mocking_path(transform, path, expected):
+    assert transform(path) == expected
 
 
 @mock_path_resolution(force_is_dir=False)
@@ -1,92 +1,145 @@
 # pylint: disable=redefined-outer-name,wrong-import-position
 
+import shlex
 import sys
-import subprocess
+import types
+from argparse import Namespace
 from unittest.mock import MagicMock, patch
 
-import yaml
-from cryri.config import CryConfig
+import pytest
 
+from tests.utils.configs import TEST_CONFIG_YAML
 
-# Since client_lib might not be installed, mock it before importing cryri modules
-mock_client_lib = MagicMock()
-mock_job_instance = MagicMock()
-mock_job_instance.submit.return_value = "test_job_id_123"
-mock_client_lib.Job.return_value = mock_job_instance
-# Inject the mock into sys.modules
-sys.modules['client_lib'] = mock_client_lib
 
-# Now it's safe to import from cryri
-from cryri.main import submit_run  # noqa: E402
+class FakeJob:
+    """Minimal stand-in for `client_lib.Job`: records constructor kwargs and submissions."""
+    created = []
+    submitted = 0
+
+    def __init__(self, **kwargs):
+        FakeJob.created.append(kwargs)
 
+    def submit(self):
+        FakeJob.submitted += 1
+        return "test_job_id_123"
 
-# Define the test configuration as a YAML string
-TEST_CONFIG_YAML = """
-container:
-  image: "cr.ai.cloud.ru/aicloud-base-images/cuda12.1-torch2-py310:0.0.36"
-  command: python -c 'print("double quotes")'
-  work_dir: '.'
+    @classmethod
+    def reset(cls):
+        cls.created = []
+        cls.submitted = 0
 
-cloud:
-  region: "SR004"
-  instance_type: "a100.1gpu"
-  n_workers: 1
-  description: "Test escape from container. #rnd #multimodality #tarasov"
-"""
 
+# Since client_lib might not be installed, stub it before importing cryri modules
+fake_client_lib = types.ModuleType("client_lib")
+fake_client_lib.Job = FakeJob
+# Inject the stub into sys.modules
+sys.modules["client_lib"] = fake_client_lib
+
+# Now it's safe to import from cryri
+from cryri.main import (  # noqa: E402
+    submit_run, _config_from_args, _handle_config_file, _execute_command,
+    _parse_job_hashes, _kill_jobs
+)
 
-# Use the mock for the duration of the test function
-# This ensures the test doesn't rely on the actual client_lib
-@patch.dict(sys.modules, {'client_lib': mock_client_lib})
-def test_submit_run_executes_command():
+
+# `client_lib` is already replaced by the stub in sys.modules above,
+# so the test doesn't rely on the actual client_lib
+def test_submit_run_executes_command(test_cry_config):
     """
-    Tests if submit_run correctly formats and can execute the container command.
-    It mocks the client_lib.Job submission and instead runs the command locally
-    using subprocess to check for basic execution errors.
+    Tests if submit_run correctly formats and quotes the container command.
+    It mocks the client_lib.Job submission and checks that the generated script
+    tokenizes back, with shell quoting rules, into the original `cd` and command.
     """
-    # Load config from YAML
-    config_dict = yaml.safe_load(TEST_CONFIG_YAML)
-    cfg = CryConfig(**config_dict)
-
-    # Reset mock calls before the test run
-    mock_client_lib.Job.reset_mock()
-    mock_job_instance.submit.reset_mock()
+    # Reset recorded calls before the test run
+    FakeJob.reset()
 
     # Call the function under test
-    job_id = submit_run(cfg)
+    job_id = submit_run(test_cry_config)
 
-    # Assertions about the mock
+    # Assertions about the stub
     assert job_id == "test_job_id_123"
-    mock_client_lib.Job.assert_called_once()
-    mock_job_instance.submit.assert_called_once()
+    assert len(FakeJob.created) == 1
+    assert FakeJob.submitted == 1
 
     # Get the arguments passed to the Job constructor
-    _, kwargs = mock_client_lib.Job.call_args
+    kwargs = FakeJob.created[0]
 
     # Extract the script command
     script_command = kwargs.get('script')
     assert script_command is not None
-    assert script_command.startswith('bash -c "cd ')
-
-    # Execute the script command using subprocess
-    # We run the full 'bash -c "cd ... && command"' string
-    # check=False allows us to inspect stderr even if it fails
-    # shell=True is necessary because we are running a shell command string
-    result = subprocess.run(
-        script_command,
-        shell=True,
-        capture_output=True,
-        text=True,
-        check=False  # Don't raise exception on non-zero exit
-    )
-
-    # Check subprocess results
-    # Ensure the command ran without errors
-    assert result.returncode == 0, f"Subprocess failed with stderr: {result.stderr}"
-    # Ensure there was no output to stderr
-    assert result.stderr == "", f"Subprocess produced stderr: {result.stderr}"
-    # Optionally check stdout
-    assert "double quotes" in result.stdout
+    assert script_command.startswith("bash -c 'cd ")
+
+    # Parse the script the way a POSIX shell would, instead of spawning one:
+    # outer level is `bash -c <script>`, inner level is `cd <work_dir> && <command>`
+    bash, flag, inner_script = shlex.split(script_command)
+    assert (bash, flag) == ("bash", "-c")
+    assert shlex.split(inner_script) == [
+        "cd", test_cry_config.container.work_dir, "&&",
+        "python", "-c", 'print("double quotes")',
+    ]
+
+
+def test_handle_config_file_submits(tmp_path):
+    config_file = tmp_path / "run.yaml"
+    config_file.write_text(TEST_CONFIG_YAML, encoding="utf-8")
+
+    FakeJob.reset()
+    _handle_config_file(str(config_file))
+
+    assert len(FakeJob.created) == 1
+    kwargs = FakeJob.created[0]
+    assert kwargs["region"] == "SR004"
+    assert kwargs["instance_type"] == "a100.1gpu"
+
+
+def test_execute_command_config_file_skips_job_manager(tmp_path):
+    config_file = tmp_path / "run.yaml"
+    config_file.write_text(TEST_CONFIG_YAML, encoding="utf-8")
+    args = Namespace(logs=None, instance_types=False, jobs=False, kill=None, config_file=str(config_file))
+
+    FakeJob.reset()
+    with patch("cryri.main.JobManager") as job_manager_cls:
+        _execute_command(args, "SR006")
+
+    job_manager_cls.assert_not_called()
+    assert len(FakeJob.created) == 1
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("aaa", ["aaa"]),
+    ("aaa,bbb", ["aaa", "bbb"]),
+    ("bbb,", ["bbb"]),
+    (",", []),
+    ("", []),
+    ("aaa, bbb ,aaa", ["aaa", "bbb"]),
+])
+def test_parse_job_hashes(value, expected):
+    assert _parse_job_hashes(value) == expected
+
+
+def test_kill_jobs_dispatch():
+    job_manager = MagicMock()
+
+    _kill_jobs(Namespace(kill="bbb,"), job_manager)
+    job_manager.kill_job.assert_called_once_with("bbb")
+    job_manager.kill_jobs.assert_not_called()
+
+    job_manager.reset_mock()
+    _kill_jobs(Namespace(kill=" , "), job_manager)
+    job_manager.kill_job.assert_not_called()
+    job_manager.kill_jobs.assert_not_called()
+
+    job_manager.reset_mock()
+    _kill_jobs(Namespace(kill="aaa, bbb,aaa"), job_manager)
+    job_manager.kill_jobs.assert_called_once_with(["aaa", "bbb"])
+
+
+def test_config_from_args_region():
+    default_cfg = _config_from_args(Namespace(region=None))
+    assert default_cfg.cloud.region == "SR006"
+
+    cfg = _config_from_args(Namespace(region="SR004"))
+    assert cfg.cloud.region == "SR004"
 
 # Reset the mock in sys.modules after tests if necessary,
 # though usually test runners isolate tests.
@@ -5,7 +5,8 @@ from cryri.validators import expand_vars_and_user, sanitize_dir_path
 from tests.utils.mocks import mock_env_vars, mock_path_resolution, make_is_dir_mock
 
 
-@pytest.fixture
+# read-only input (expand_vars_and_user never mutates it), so it is built once per module
+@pytest.fixture(scope="module")
 def expandable_struct():
     return {
         1: 2,
@@ -16,6 +17,11 @@ def expandable_struct():
         "TEST_VAR3": "~/prefix/$EXISTING_VAR/suffix",
         "TEST_VAR4": "~/prefix/$NON_EXISTING_VAR/suffix",
         "TEST_VAR5": "$100 bucks",
+        "TEST_VAR6": "${EXISTING_VAR}",
+        "TEST_VAR7": "~/prefix_${EXISTING_VAR}_suffix",
+        "TEST_VAR8": "${NON_EXISTING_VAR}",
+        "TEST_VAR9": "${}",
+        "TEST_VAR10": "${EXISTING_VAR",
         "sub_dict": {
             "TEST_VAR": "no expansion",
             "TEST_VAR2": "$EXISTING_VAR",
@@ -62,6 +68,11 @@ def test_expand_vars_and_user(expandable_struct):
         "TEST_VAR3": "<SOME_PATH>/prefix/!SPECIAL_VALUE!/suffix",
         "TEST_VAR4": "<SOME_PATH>/prefix/$NON_EXISTING_VAR/suffix",
         "TEST_VAR5": "$100 bucks",
+        "TEST_VAR6": "!SPECIAL_VALUE!",
+        "TEST_VAR7": "<SOME_PATH>/prefix_!SPECIAL_VALUE!_suffix",
+        "TEST_VAR8": "${NON_EXISTING_VAR}",
+        "TEST_VAR9": "${}",
+        "TEST_VAR10": "${EXISTING_VAR",
         "sub_dict": {
             "TEST_VAR": "no expansion",
             "TEST_VAR2": "!SPECIAL_VALUE!",
@@ -91,6 +102,18 @@ def test_expand_vars_and_user(expandable_struct):
     assert expand_vars_and_user(None) is None
 
 
+def test_expand_vars_and_user_no_expansion_returns_original():
+    struct = {
+        "TEST_VAR": "no expansion",
+        "sub_list": [None, 1, "path/~/with/tilde"],
+        "sub_tuple": ("a", ("b", "c")),
+    }
+    result = expand_vars_and_user(struct)
+
+    assert result is struct
+    assert result["sub_list"] is struct["sub_list"]
+
+
 @mock_env_vars(__exclude__=["NON_EXISTING_VAR"])
 def test_expand_vars_and_user_warning(caplog):
     # Check: warns user if any "$" signs in a resulting strings
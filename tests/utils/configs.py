@@ -0,0 +1,13 @@
+# Test configuration shared across test modules, as a YAML string
+TEST_CONFIG_YAML = """
+container:
+  image: "cr.ai.cloud.ru/aicloud-base-images/cuda12.1-torch2-py310:0.0.36"
+  command: python -c 'print("double quotes")'
+  work_dir: '.'
+
+cloud:
+  region: "SR004"
+  instance_type: "a100.1gpu"
+  n_workers: 1
+  description: "Test escape from container. #rnd #multimodality #tarasov"
+"""
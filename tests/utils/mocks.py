@@ -1,10 +1,15 @@
+import atexit
 import os
+import shutil
 import tempfile
 from contextlib import ExitStack
-from functools import wraps
+from functools import lru_cache, wraps
 from pathlib import Path
 from unittest.mock import patch
 
+# marks env vars that were not set before patching
+_MISSING = object()
+
 
 def mock_env_vars(__exclude__=None, **env_vars):
     """
@@ -16,19 +21,24 @@ def mock_env_vars(__exclude__=None, **env_vars):
     def decorator(test_func):
         @wraps(test_func)
         def wrapper(*args, **kwargs):
-            with patch.dict(os.environ, env_vars, clear=False):
-                # Delete excluded keys from os.environ temporarily
-                to_restore = {k: os.environ[k] for k in __exclude__ if k in os.environ}
-                for k in to_restore:
-                    os.environ.pop(k)
-                try:
-                    return test_func(*args, **kwargs)
-                finally:
-                    os.environ.update(to_restore)
+            # Save and restore only the touched keys instead of snapshotting the whole os.environ
+            touched = [(k, os.environ.get(k, _MISSING)) for k in env_vars]
+            os.environ.update(env_vars)
+            # Delete excluded keys from os.environ temporarily (single pop per key)
+            excluded = [(k, os.environ.pop(k, _MISSING)) for k in __exclude__]
+            try:
+                return test_func(*args, **kwargs)
+            finally:
+                # restore in reverse order of patching
+                for k, v in excluded + touched:
+                    if v is _MISSING:
+                        os.environ.pop(k, None)
+                    else:
+                        os.environ[k] = v
         return wrapper
 
-    # set of excluded keys
-    __exclude__ = set(__exclude__ or [])
+    # unique excluded keys; only iterated, so a tuple is enough
+    __exclude__ = tuple(dict.fromkeys(__exclude__ or []))
 
     # automatically add 'USERPROFILE' if 'HOME' is present to cover WINDOWS case too
     if 'HOME' in env_vars and 'USERPROFILE' not in env_vars:
@@ -40,14 +50,23 @@ def mock_env_vars(__exclude__=None, **env_vars):
 def make_is_dir_mock(file_extensions=None):
     """Construct a mock for `Path.is_dir()` method based on a file extension presence."""
     def _mock(self: Path) -> bool:
-        return self.suffix not in file_extensions
+        return not is_file_extension(self.suffix)
 
     if isinstance(file_extensions, str):
         file_extensions = {file_extensions}
-    file_extensions = file_extensions or {".py", ".yaml", ".json", ".env", ".txt", ".md"}
+    file_extensions = frozenset(file_extensions or {".py", ".yaml", ".json", ".env", ".txt", ".md"})
+    is_file_extension = file_extensions.__contains__
     return _mock
 
 
+@lru_cache(maxsize=None)
+def _shared_tmp_dir():
+    """Temp dir created on first use and shared by all tests; removed at interpreter exit."""
+    tmp_dir = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, tmp_dir, ignore_errors=True)
+    return tmp_dir
+
+
 def mock_path_resolution(
         cwd=None, extra_resolve_map=None, force_is_dir=make_is_dir_mock
 ):
@@ -55,7 +74,7 @@ def mock_path_resolution(
     Decorator to mock Path.resolve(), cwd, and optionally Path.is_dir().
 
     Args:
-        cwd (str): mocked current working directory. Defaults to temp dir.
+        cwd (str): mocked current working directory. Defaults to a shared temp dir.
         extra_resolve_map (dict): maps input path strings to resolved output strings.
         force_is_dir (bool | callable): if True or False, patches Path.is_dir().
             If callable(Path) -> bool, uses custom logic per path.
@@ -66,9 +85,13 @@ def mock_path_resolution(
             # Fake Path.resolve() logic
             def custom_resolve(self: Path):
                 key = str(self)
-                if extra_resolve_map and key in extra_resolve_map:
-                    return Path(extra_resolve_map[key])
-                return Path(os.path.join(self.cwd(), key))
+                if extra_resolve_map is not None:
+                    mapped = extra_resolve_map.get(key)
+                    if mapped is not None:
+                        return Path(mapped)
+                if key.startswith("/"):
+                    return Path(key)
+                return Path(cwd_str + "/" + key)
 
             # Fake Path.is_dir() logic (optional)
             def is_dir_wrapper(self: Path):
@@ -76,22 +99,23 @@ def mock_path_resolution(
                     return force_is_dir(self)
                 return bool(force_is_dir)
 
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # use provided cwd or create temp dir (which is auto-deleted)
-                target_cwd = Path(cwd or temp_dir)
+            # use provided cwd or a shared temp dir (which is deleted at exit)
+            target_cwd = Path(cwd or _shared_tmp_dir())
+            cwd_str = str(target_cwd)
 
-                # fancy dynamic way of stacking `with` context managers
-                with ExitStack() as stack:
-                    stack.enter_context(patch("os.getcwd", return_value=str(target_cwd)))
-                    stack.enter_context(patch("pathlib.Path.cwd", return_value=target_cwd))
-                    stack.enter_context(patch("pathlib.Path.resolve", new=custom_resolve))
+            # fancy dynamic way of stacking `with` context managers
+            with ExitStack() as stack:
+                # `patch.object` on already imported targets skips resolving dotted import paths
+                stack.enter_context(patch.object(os, "getcwd", return_value=str(target_cwd)))
+                stack.enter_context(patch.object(Path, "cwd", return_value=target_cwd))
+                stack.enter_context(patch.object(Path, "resolve", new=custom_resolve))
 
-                    if force_is_dir is not None:
-                        stack.enter_context(
-                            patch("pathlib.Path.is_dir", new=is_dir_wrapper)
-                        )
+                if force_is_dir is not None:
+                    stack.enter_context(
+                        patch.object(Path, "is_dir", new=is_dir_wrapper)
+                    )
 
-                    return test_func(*args, **kwargs)
+                return test_func(*args, **kwargs)
 
         return wrapper
     return decorator